@@ -1,16 +1,44 @@
+import asyncio
+import copy
 import os
-import serpapi
 import requests
-from bs4 import BeautifulSoup
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.parser import HTMLParser
+
+# Cap on bytes read per page: parse cost scales with input size, and anything
+# useful for a summary fits well within this.
+MAX_BYTES = 2_000_000
 
 class BrowserAgent:
+    # mostly network wait; run() stays on the orchestrator's thread pool
+    CPU_BOUND = False
+
     def __init__(self):
         self.api_key = os.getenv("SERPAPI_API_KEY")
         if not self.api_key:
             raise ValueError("SERPAPI_API_KEY not set in environment")
 
-        # Initialize SerpAPI client
-        self.client = serpapi.Client(api_key=self.api_key)
+        # Pooled session: keep-alive avoids a fresh TCP+TLS handshake per scrape
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.3),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # brotli (requirements) lets requests decode "br" transparently
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept-Encoding": "gzip, br, deflate",
+        })
+
+        # TTL caches: repeated queries skip SerpAPI entirely, and distinct
+        # queries resolving to the same top URL skip the re-scrape.
+        self._search_cache = TTLCache(maxsize=1024, ttl=600)
+        self._page_cache = TTLCache(maxsize=1024, ttl=600)
 
     def run(self, query: str) -> dict:
         """
@@ -19,9 +47,19 @@ class BrowserAgent:
         Step 3: Scrape full article text
         """
 
-        # SERPAPI SEARCH
+        cache_key = query.strip().lower()
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return {"status": "success", "data": copy.deepcopy(cached)}
+
+        # SERPAPI SEARCH (raw JSON endpoint on the pooled session: the SDK
+        # opens a fresh connection per .search(), paying a TLS handshake each time)
         try:
-            result = self.client.search({"engine": "google", "q": query})
+            result = self.session.get(
+                "https://serpapi.com/search.json",
+                params={"engine": "google", "q": query, "api_key": self.api_key},
+                timeout=10,
+            ).json()
         except Exception as e:
             return {"status": "failed", "error": f"SerpAPI error: {e}"}
 
@@ -34,27 +72,124 @@ class BrowserAgent:
         snippet = first.get("snippet", "")
 
         # SCRAPE WEBSITE
-        full_text = ""
-        try:
-            res = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-            soup = BeautifulSoup(res.text, "html.parser")
+        scrape_ok = True
+        full_text = self._page_cache.get(url)
+        if full_text is None:
+            try:
+                # with-block closes the response even after a partial read or
+                # the non-HTML early exit, returning the socket to the pool
+                with self.session.get(url, stream=True, timeout=(3, 10)) as res:
+                    content_type = res.headers.get("Content-Type", "")
+                    if "text/html" not in content_type:
+                        raise ValueError(f"Not an HTML page: {content_type or 'unknown content type'}")
+                    # read at most MAX_BYTES so a multi-MB page can't blow up
+                    # parse time; selectolax takes raw bytes and handles the
+                    # encoding itself, running the <p> traversal in C with no
+                    # per-node wrapper objects
+                    body = res.raw.read(MAX_BYTES, decode_content=True)
+                tree = HTMLParser(body)
+                clean_text = [
+                    n.text(strip=True)
+                    for n in tree.css("p") if n.text(strip=True)
+                ]
+
+                full_text = "\n\n".join(clean_text) if clean_text else "No readable content found."
+                self._page_cache[url] = full_text
 
-            paragraphs = soup.find_all("p")
-            clean_text = [
-                p.get_text(strip=True)
-                for p in paragraphs if p.get_text(strip=True)
-            ]
+            except Exception as e:
+                scrape_ok = False
+                full_text = f"Scraping failed: {e}"
 
-            full_text = "\n\n".join(clean_text) if clean_text else "No readable content found."
+        data = {
+            "url": url,
+            "snippet": snippet,
+            "full_text": full_text,
+        }
+        # never cache a failed scrape: a transient timeout would otherwise
+        # poison every repeat of this query for the full TTL
+        if scrape_ok:
+            self._search_cache[cache_key] = copy.deepcopy(data)
+        return {"status": "success", "data": data}
 
+    async def arun(self, query: str, client) -> dict:
+        """
+        Async variant of run() using a shared httpx.AsyncClient, so the
+        FastAPI event loop is never blocked on SerpAPI or the scrape.
+        """
+
+        cache_key = query.strip().lower()
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return {"status": "success", "data": copy.deepcopy(cached)}
+
+        # SERPAPI SEARCH (raw JSON endpoint; the SDK is sync-only).
+        # A HEAD request runs in parallel purely to warm the client pool with a
+        # live socket, overlapping DNS/TLS setup with SerpAPI latency so the
+        # follow-up scrape starts on an already-negotiated connection.
+        try:
+            res, _warmup = await asyncio.gather(
+                client.get(
+                    "https://serpapi.com/search.json",
+                    params={"engine": "google", "q": query, "api_key": self.api_key},
+                ),
+                client.head("https://www.google.com"),
+                return_exceptions=True,
+            )
+            if isinstance(res, Exception):
+                raise res
+            result = res.json()
         except Exception as e:
-            full_text = f"Scraping failed: {e}"
-
-        return {
-            "status": "success",
-            "data": {
-                "url": url,
-                "snippet": snippet,
-                "full_text": full_text,
-            }
+            return {"status": "failed", "error": f"SerpAPI error: {e}"}
+
+        organic = result.get("organic_results", [])
+        if not organic:
+            return {"status": "failed", "error": "No organic search results found"}
+
+        first = organic[0]
+        url = first.get("link")
+        snippet = first.get("snippet", "")
+
+        # SCRAPE WEBSITE
+        scrape_ok = True
+        full_text = self._page_cache.get(url)
+        if full_text is None:
+            try:
+                # same cap/guard as run(): stream at most MAX_BYTES of HTML
+                # instead of buffering an unbounded body
+                async with client.stream("GET", url, headers={"User-Agent": "Mozilla/5.0"}) as res:
+                    content_type = res.headers.get("Content-Type", "")
+                    if "text/html" not in content_type:
+                        raise ValueError(f"Not an HTML page: {content_type or 'unknown content type'}")
+                    chunks = []
+                    received = 0
+                    async for chunk in res.aiter_bytes():
+                        chunks.append(chunk)
+                        received += len(chunk)
+                        if received >= MAX_BYTES:
+                            break
+                body = b"".join(chunks)[:MAX_BYTES]
+                # raw bytes: the C parser detects the encoding itself, skipping
+                # an up-front decode of the whole body to str
+                tree = HTMLParser(body)
+                clean_text = [
+                    n.text(strip=True)
+                    for n in tree.css("p") if n.text(strip=True)
+                ]
+
+                full_text = "\n\n".join(clean_text) if clean_text else "No readable content found."
+                self._page_cache[url] = full_text
+
+            except Exception as e:
+                scrape_ok = False
+                full_text = f"Scraping failed: {e}"
+
+        data = {
+            "url": url,
+            "snippet": snippet,
+            "full_text": full_text,
         }
+        # never cache a failed scrape: a transient timeout would otherwise
+        # poison every repeat of this query for the full TTL
+        if scrape_ok:
+            self._search_cache[cache_key] = copy.deepcopy(data)
+        return {"status": "success", "data": data}
@@ -1,20 +1,64 @@
 # agents/extractor_agent.py
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Cap on bytes read per page; parse cost scales with input size
+MAX_BYTES = 2_000_000
+
+# Compiled once: a single fused pass collapses space/tab runs and newline runs,
+# and the translate table drops non-ASCII at C level (no encode/decode round-trip)
+_WSALL_RE = re.compile(r"[ \t]+|\n+")
+
+class _AsciiStripTable:
+    """
+    str.translate table dropping every codepoint >= 0x80. A real dict over that
+    range costs tens of MB per process; translate() only needs __getitem__, so
+    raise LookupError to keep ASCII and return None to delete the rest.
+    """
+    def __getitem__(self, codepoint: int):
+        if codepoint < 0x80:
+            raise LookupError(codepoint)
+        return None
+
+_ASCII_TABLE = _AsciiStripTable()
+
+def _collapse_ws(match: "re.Match") -> str:
+    return "\n" if match.group().startswith("\n") else " "
 
 class ExtractorAgent:
+    # parsing + regex cleaning dominate; orchestrator dispatches run() to its process pool
+    CPU_BOUND = True
+
+    def __init__(self):
+        # Pooled session so repeated fetches reuse connections instead of re-handshaking
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.3),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # brotli (requirements) lets requests decode "br" transparently
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept-Encoding": "gzip, br, deflate",
+        })
+
     def clean_text(self, text: str) -> str:
-        text = re.sub(r" +", " ", text)
-        text = re.sub(r"\n+", "\n", text)
-        text = text.encode("ascii", "ignore").decode("ascii")
+        text = _WSALL_RE.sub(_collapse_ws, text)
+        text = text.translate(_ASCII_TABLE)
         return text.strip()
 
     def extract_text(self, html: str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
-        for tag in soup(["script", "style", "header", "footer", "nav", "noscript"]):
-            tag.extract()
-        text = soup.get_text(separator="\n")
+        tree = HTMLParser(html)
+        for tag in tree.css("script,style,header,footer,nav,noscript"):
+            tag.decompose()
+        body = tree.body
+        text = body.text(separator="\n") if body is not None else ""
         return self.clean_text(text)
 
     def run(self, url: str) -> dict:
@@ -22,8 +66,40 @@ class ExtractorAgent:
             return {"status": "failed", "error": "No URL provided"}
 
         try:
-            res = requests.get(url, timeout=10)
-            html = res.text
+            # with-block closes the response even after a partial read or the
+            # non-HTML early exit, returning the socket to the pool
+            with self.session.get(url, stream=True, timeout=(3, 10)) as res:
+                content_type = res.headers.get("Content-Type", "")
+                if "text/html" not in content_type:
+                    return {"status": "failed", "error": f"Not an HTML page: {content_type or 'unknown content type'}"}
+                # truncated bytes go straight to selectolax, which handles the encoding
+                html = res.raw.read(MAX_BYTES, decode_content=True)
+        except Exception as e:
+            return {"status": "failed", "error": f"Failed to fetch URL: {e}"}
+
+        clean = self.extract_text(html)
+        return {"status": "success", "data": {"clean_text": clean}}
+
+    async def arun(self, url: str, client) -> dict:
+        """Async variant of run() fetching through a shared httpx.AsyncClient."""
+        if not url:
+            return {"status": "failed", "error": "No URL provided"}
+
+        try:
+            # same cap/guard as run(): stream at most MAX_BYTES of HTML instead
+            # of buffering and decoding an unbounded body
+            async with client.stream("GET", url) as res:
+                content_type = res.headers.get("Content-Type", "")
+                if "text/html" not in content_type:
+                    return {"status": "failed", "error": f"Not an HTML page: {content_type or 'unknown content type'}"}
+                chunks = []
+                received = 0
+                async for chunk in res.aiter_bytes():
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= MAX_BYTES:
+                        break
+            html = b"".join(chunks)[:MAX_BYTES]
         except Exception as e:
             return {"status": "failed", "error": f"Failed to fetch URL: {e}"}
 
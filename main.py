@@ -1,4 +1,9 @@
+from contextlib import asynccontextmanager
+
+import httpx
+import uvloop
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 from agents.browser_agent import BrowserAgent
@@ -8,7 +13,24 @@ from dotenv import load_dotenv
 # Load .env variables
 load_dotenv()
 
-app = FastAPI()
+
+# Shared async HTTP client: one pool for all scrapes / SerpAPI / Groq calls,
+# created on startup and closed on shutdown.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=50),
+        # advertise compression once; httpx decodes transparently
+        headers={"Accept-Encoding": "gzip, br"},
+    )
+    yield
+    await app.state.http.aclose()
+
+
+# orjson renders large job/report payloads several times faster than stdlib json
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Enable CORS so Streamlit can connect
 app.add_middleware(
@@ -41,10 +63,15 @@ async def run_query(request: QueryRequest):
     if agent is None:
         return {"detail": "BrowserAgent not initialized on server"}
 
-    response = agent.run(request.query)
+    response = await agent.arun(request.query, app.state.http)
     return {"response": response}
 
 
 # Start server
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    # uvloop + httptools: faster event loop and HTTP parsing than the
+    # asyncio/h11 defaults; install uvloop first so orchestrator background
+    # tasks run on it too.
+    uvloop.install()
+    uvicorn.run("main:app", host="127.0.0.1", port=8000,
+                loop="uvloop", http="httptools", workers=2)
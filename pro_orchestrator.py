@@ -21,11 +21,30 @@ Workflow payload example:
 """
 from __future__ import annotations
 import asyncio
+import concurrent.futures
+import inspect
+import os
 import time
 import uuid
 import traceback
+from collections import deque
 from typing import Any, Dict, List, Optional
 
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# Jobs persisted to Redis expire after a day
+JOB_TTL_SECONDS = 86400
+
+# Ring-buffer sizes: retries on long jobs append forever, so cap per-job
+# memory while keeping the recent entries that matter for debugging
+MAX_LOG_ENTRIES = 512
+MAX_HISTORY_ENTRIES = 256
+
 def now_ts() -> float:
     return time.time()
 
@@ -33,13 +52,59 @@ class Orchestrator:
     def __init__(self):
         # name -> agent instance
         self.agents: Dict[str, Any] = {}
-        # in-memory jobs store
+        # in-memory jobs store; single-key dict assignment is atomic under the
+        # GIL and nothing awaits between read and write, so no lock is needed
         self.jobs: Dict[str, dict] = {}
-        self._lock = asyncio.Lock()
+        # optional Redis mirror: survives restarts and lets multiple API
+        # workers see each other's jobs (set REDIS_URL to enable)
+        redis_url = os.getenv("REDIS_URL")
+        self.redis = aioredis.from_url(redis_url) if (redis_url and aioredis) else None
+        # Sync agents run off the event loop: CPU-bound ones (HTML parsing,
+        # regex cleaning) in a process pool so the GIL doesn't serialize them,
+        # I/O-bound ones in a wide thread pool. Agents opt into the process
+        # pool with a CPU_BOUND = True class attribute.
+        self._cpu_pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=64)
+        # per-agent capability flags, filled in by register_agent
+        self._agent_caps: Dict[str, dict] = {}
+        # input_path string -> (step_idx, (key, ...)) or None if unparseable,
+        # so retries and repeated workflows never re-split the same literal
+        self._path_cache: Dict[str, Optional[tuple]] = {}
 
     def register_agent(self, name: str, agent: Any):
         """Register an agent instance under a name (string)."""
         self.agents[name] = agent
+        # reflect on the agent once here so the per-step hot path does no
+        # hasattr/iscoroutinefunction calls
+        run = getattr(agent, "run", None)
+        self._agent_caps[name] = {
+            "arun": callable(getattr(agent, "arun", None)),
+            "run": callable(run),
+            "run_async": asyncio.iscoroutinefunction(run),
+        }
+
+    def _compile_path(self, input_path: str) -> Optional[tuple]:
+        """
+        Parse "previous.steps.<i>.data.<key1>.<key2>..." once into
+        (step_idx, (key1, key2, ...)), memoized per literal string.
+        Returns None for paths that don't match the supported pattern.
+        """
+        try:
+            return self._path_cache[input_path]
+        except KeyError:
+            pass
+
+        compiled = None
+        if input_path.startswith("previous."):
+            parts = input_path.split(".")
+            # expected: previous, steps, <idx>, data, <key1>, <key2>...
+            if len(parts) >= 5 and parts[1] == "steps" and parts[3] == "data":
+                try:
+                    compiled = (int(parts[2]), tuple(parts[4:]))
+                except ValueError:
+                    compiled = None
+        self._path_cache[input_path] = compiled
+        return compiled
 
     def _resolve_input(self, step: dict, job: dict) -> dict:
         """
@@ -55,30 +120,59 @@ class Orchestrator:
         if not input_path:
             return base
 
-        # Only handle simple "previous.steps.<i>.data.<key>" patterns
+        # prefer the path precompiled at start_workflow; fall back to the cache
+        compiled = step["_compiled_path"] if "_compiled_path" in step else self._compile_path(input_path)
+        if compiled is None:
+            return base
+
         try:
-            if input_path.startswith("previous."):
-                parts = input_path.split(".")
-                # expected: previous, steps, <idx>, data, <key1>, <key2>...
-                if len(parts) >= 5 and parts[1] == "steps" and parts[3] == "data":
-                    idx = int(parts[2])
-                    rest = parts[4:]
-                    prev_result = job.get("result", [])[idx] if idx < len(job.get("result", [])) else None
-                    if prev_result:
-                        val = prev_result.get("data") or {}
-                        for p in rest:
-                            if isinstance(val, dict):
-                                val = val.get(p)
-                            else:
-                                val = None
-                        base["_from_previous"] = val
-                        return base
+            idx, rest = compiled
+            prev_result = job.get("result", [])[idx] if idx < len(job.get("result", [])) else None
+            if prev_result:
+                val = prev_result.get("data") or {}
+                for p in rest:
+                    if isinstance(val, dict):
+                        val = val.get(p)
+                    else:
+                        val = None
+                base["_from_previous"] = val
         except Exception:
             # on any error, return base as-is and let agent handle missing data
-            return base
+            pass
 
         return base
 
+    async def _save_job(self, job: dict):
+        """Persist a job snapshot to Redis (no-op when Redis is not configured)."""
+        if self.redis is None:
+            return
+        try:
+            # deques aren't JSON types; snapshot them as lists
+            snapshot = {**job, "logs": list(job["logs"]), "agent_history": list(job["agent_history"])}
+            await self.redis.setex(
+                f"job:{job['id']}", JOB_TTL_SECONDS, orjson.dumps(snapshot, default=str)
+            )
+        except Exception:
+            # persistence is best-effort; the in-memory copy stays authoritative
+            pass
+
+    def _step_dependencies(self, step: dict) -> set:
+        """
+        Return the set of previous-step indices a step depends on, parsed from
+        its "input_path" ("previous.steps.<i>...."). Steps without an
+        input_path depend on nothing and can run concurrently.
+        """
+        input_path = step.get("input_path")
+        if not input_path or not input_path.startswith("previous."):
+            return set()
+        parts = input_path.split(".")
+        if len(parts) >= 3 and parts[1] == "steps":
+            try:
+                return {int(parts[2])}
+            except ValueError:
+                return set()
+        return set()
+
     async def _call_agent(self, agent_name: str, payload: dict, timeout: Optional[int] = None) -> dict:
         """
         Call a registered agent. Agent may expose:
@@ -90,18 +184,27 @@ class Orchestrator:
         agent = self.agents.get(agent_name)
         if agent is None:
             return {"status": "failed", "error": f"agent '{agent_name}' not registered"}
+        caps = self._agent_caps.get(agent_name, {})
 
         async def _invoke():
             try:
-                # prefer asynchronous method if available
-                if hasattr(agent, "arun") and asyncio.iscoroutinefunction(getattr(agent, "arun")):
-                    return await agent.arun(payload)
-                elif hasattr(agent, "run") and asyncio.iscoroutinefunction(getattr(agent, "run")):
+                # prefer the native-async path; duck-type rather than require a
+                # coroutine function, so wrappers returning awaitables also skip
+                # the executor hop
+                if caps.get("arun"):
+                    result = agent.arun(payload)
+                    return await result if inspect.isawaitable(result) else result
+                elif caps.get("run_async"):
                     return await agent.run(payload)  # uncommon: async run
-                elif hasattr(agent, "run"):
-                    # sync run -> run in executor to avoid blocking event loop
+                elif caps.get("run"):
+                    # sync run -> run in executor to avoid blocking event loop.
+                    # Process-pool dispatch pickles the agent (including any
+                    # requests.Session) per call, so pooled connections are not
+                    # reused by workers — only flag agents CPU_BOUND when the
+                    # parsing genuinely outweighs that cost.
                     loop = asyncio.get_running_loop()
-                    return await loop.run_in_executor(None, agent.run, payload)
+                    pool = self._cpu_pool if getattr(agent, "CPU_BOUND", False) else self._io_pool
+                    return await loop.run_in_executor(pool, agent.run, payload)
                 else:
                     return {"status": "failed", "error": "agent has no run/arun method"}
             except Exception as e:
@@ -165,7 +268,9 @@ class Orchestrator:
                 # standardize returned data to be under "data"
                 return {"status": "success", "data": result.get("data", result)}
             else:
-                last_err = result
+                # full traceback stays on the agent_history entry only; don't
+                # duplicate kilobyte-size strings into the returned error
+                last_err = {k: v for k, v in result.items() if k != "traceback"} if isinstance(result, dict) else result
                 job["logs"].append({"ts": now_ts(), "level": "warning", "msg": f"{name} attempt {attempt} failed: {result.get('error') if isinstance(result, dict) else str(result)}"})
                 # exponential backoff sleep
                 await asyncio.sleep(0.5 * (2 ** (attempt - 1)))
@@ -184,13 +289,19 @@ class Orchestrator:
             "status": "running",
             "submitted_at": now_ts(),
             "payload": payload,
-            "logs": [],
-            "agent_history": [],
+            "logs": deque(maxlen=MAX_LOG_ENTRIES),
+            "agent_history": deque(maxlen=MAX_HISTORY_ENTRIES),
             "result": [],  # list of per-step structured results
         }
 
-        async with self._lock:
-            self.jobs[job_id] = job
+        # compile every input_path up front so per-attempt resolution is a
+        # plain tuple walk with no string parsing or cache lookup
+        for step in payload.get("steps", []):
+            if step.get("input_path"):
+                step["_compiled_path"] = self._compile_path(step["input_path"])
+
+        self.jobs[job_id] = job
+        await self._save_job(job)
 
         # fire-and-forget execution
         asyncio.create_task(self._execute_workflow(job_id))
@@ -198,31 +309,52 @@ class Orchestrator:
 
     async def _execute_workflow(self, job_id: str):
         # fetch job
-        async with self._lock:
-            job = self.jobs.get(job_id)
+        job = self.jobs.get(job_id)
         if not job:
             return
 
         steps = job["payload"].get("steps", [])
 
-        for idx, step in enumerate(steps):
-            step_resp = await self._run_step(job, idx, step)
-            # append standardized step result
-            job["result"].append({"status": step_resp.get("status"), "data": step_resp.get("data")})
-
-            if step_resp.get("status") != "success":
+        # Build dependency sets, then run steps level by level: every step whose
+        # dependencies are already done runs concurrently with its peers via
+        # asyncio.gather, so independent I/O (e.g. multiple searches) overlaps.
+        deps = [self._step_dependencies(step) for step in steps]
+        job["result"] = [None] * len(steps)
+        done: set = set()
+
+        while len(done) < len(steps):
+            level = [idx for idx in range(len(steps))
+                     if idx not in done and deps[idx] <= done]
+            if not level:
+                # circular or forward reference; fall back to remaining order
+                level = [idx for idx in range(len(steps)) if idx not in done]
+
+            level_resps = await asyncio.gather(
+                *[self._run_step(job, idx, steps[idx]) for idx in level]
+            )
+
+            failed_at = None
+            for idx, step_resp in zip(level, level_resps):
+                # record standardized step result at its index
+                job["result"][idx] = {"status": step_resp.get("status"), "data": step_resp.get("data")}
+                done.add(idx)
+                if step_resp.get("status") != "success" and failed_at is None:
+                    failed_at = idx
+
+            if failed_at is not None:
                 job["status"] = "failed"
                 job["finished_at"] = now_ts()
-                job["logs"].append({"ts": now_ts(), "level": "error", "msg": f"Workflow failed at step {idx} ({step.get('name')})"})
-                async with self._lock:
-                    self.jobs[job_id] = job
+                job["logs"].append({"ts": now_ts(), "level": "error", "msg": f"Workflow failed at step {failed_at} ({steps[failed_at].get('name')})"})
+                await self._save_job(job)
                 return
 
+            # snapshot progress so pollers on other workers see completed levels
+            await self._save_job(job)
+
         job["status"] = "finished"
         job["finished_at"] = now_ts()
         job["logs"].append({"ts": now_ts(), "level": "info", "msg": "Workflow completed successfully"})
-        async with self._lock:
-            self.jobs[job_id] = job
+        await self._save_job(job)
 
     def get_job(self, job_id: str) -> Optional[dict]:
         return self.jobs.get(job_id)
@@ -230,6 +362,27 @@ class Orchestrator:
     def list_jobs(self) -> List[dict]:
         return list(self.jobs.values())
 
+    async def aget_job(self, job_id: str) -> Optional[dict]:
+        """Like get_job, but falls back to Redis for jobs owned by another worker."""
+        job = self.jobs.get(job_id)
+        if job is not None or self.redis is None:
+            return job
+        raw = await self.redis.get(f"job:{job_id}")
+        return orjson.loads(raw) if raw else None
+
+    async def alist_jobs(self) -> List[dict]:
+        """Like list_jobs, but includes Redis-persisted jobs from all workers."""
+        if self.redis is None:
+            return self.list_jobs()
+        jobs = dict(self.jobs)
+        async for key in self.redis.scan_iter(match="job:*"):
+            job_id = key.decode().split(":", 1)[1] if isinstance(key, bytes) else key.split(":", 1)[1]
+            if job_id not in jobs:
+                raw = await self.redis.get(key)
+                if raw:
+                    jobs[job_id] = orjson.loads(raw)
+        return list(jobs.values())
+
 # -------------------- Example integration & adapters --------------------
 # The following snippet demonstrates how to register agents and run a workflow.
 # Place your real agents in multi_agent_system/agents/ and import them here.
@@ -250,10 +403,16 @@ if __name__ == "__main__":
         SummaryAgent = None
         ReporterAgent = None
 
-    # Adapter example: wrap an agent that expects positional args or a different signature
+    # Adapter example: wrap an agent that expects positional args or a different
+    # signature. Forward CPU_BOUND so the orchestrator (which only sees the
+    # adapter) still routes CPU-heavy agents to its process pool. Note that a
+    # process-pool dispatch pickles the adapter and wrapped agent per call,
+    # including any requests.Session, so workers rebuild connections each time —
+    # CPU_BOUND is worth it only when parsing dominates the fetch.
     class BrowserAdapter:
         def __init__(self, real_agent):
             self._a = real_agent
+            self.CPU_BOUND = getattr(real_agent, "CPU_BOUND", False)
         def run(self, payload: dict):
             # if real_agent.run expects a single string query, adapt here:
             q = payload.get("query") or payload.get("_from_previous") or payload.get("text")
@@ -262,6 +421,7 @@ if __name__ == "__main__":
     class ExtractorAdapter:
         def __init__(self, real_agent):
             self._a = real_agent
+            self.CPU_BOUND = getattr(real_agent, "CPU_BOUND", False)
         def run(self, payload: dict):
             # real extractor might expect raw html string
             html = payload.get("_from_previous") or payload.get("html")
@@ -270,6 +430,7 @@ if __name__ == "__main__":
     class SummarizerAdapter:
         def __init__(self, real_agent):
             self._a = real_agent
+            self.CPU_BOUND = getattr(real_agent, "CPU_BOUND", False)
         async def arun(self, payload: dict):
             # if real agent has sync run, run in executor
             text = payload.get("_from_previous") or payload.get("clean_text")
@@ -284,6 +445,7 @@ if __name__ == "__main__":
     class ReporterAdapter:
         def __init__(self, real_agent):
             self._a = real_agent
+            self.CPU_BOUND = getattr(real_agent, "CPU_BOUND", False)
         def run(self, payload: dict):
             # reporter might want (url, summary) or just summary
             summary = payload.get("_from_previous") or payload.get("summary") or payload.get("text")
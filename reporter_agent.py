@@ -1,7 +1,12 @@
 # agents/reporter_agent.py
+import html
+
 class ReporterAgent:
     def run(self, url: str, summary: str) -> dict:
         if not summary:
             return {"status": "failed", "error": "No summary provided"}
         report_text = f"📄 REPORT\nURL: {url}\n\nSummary:\n{summary}"
-        return {"status": "success", "data": {"report": report_text}}
+        # escaped once here so the frontend renders it without per-render
+        # replace calls or pushing unescaped text through unsafe_allow_html
+        report_html = html.escape(report_text).replace("\n", "<br>")
+        return {"status": "success", "data": {"report": report_text, "report_html": report_html}}
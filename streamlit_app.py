@@ -1,6 +1,7 @@
+import html
+
 import streamlit as st
 import requests
-import time
 
 st.set_page_config(page_title="Multi-Agent System", layout="wide")
 
@@ -11,54 +12,15 @@ BACKEND_URL = "http://127.0.0.1:8000"
 user_query = st.text_input("Ask something:")
 
 
-# 🔄 Simple animated dots loading
-def animated_loader(message, duration=2.5):
-    placeholder = st.empty()
-    dots = ["", ".", "..", "..."]
-    start = time.time()
-    i = 0
-    while time.time() - start < duration:
-        placeholder.markdown(f"**{message}{dots[i % 4]}**")
-        time.sleep(0.4)
-        i += 1
-    placeholder.empty()
-
-
 if st.button("Run"):
     if not user_query.strip():
         st.warning("Please enter a query")
     else:
 
-        # 🧠 Agent Thinking Steps UI
-        st.write("### 🧠 Agent Thinking Steps")
-        thinking_box = st.empty()
-
-        def step(msg):
-            thinking_box.markdown(
-                f"""
-                <div style="
-                    background-color:#222;
-                    padding:12px;
-                    border-radius:8px;
-                    border-left: 4px solid #4CAF50;
-                    margin-bottom:8px;
-                ">
-                    <b style="color:#4CAF50;">✔</b> 
-                    <span style="color:#EEE;">{msg}</span>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-            time.sleep(0.5)
-
-        # SHOW THINKING STEPS (Frontend only)
-        step("Initializing Browser Agent")
-        animated_loader("Connecting to backend")
-        step("Sending query to backend")
-        animated_loader("Waiting for search results")
-
-        with st.spinner("Finalizing…"):
+        # 🧠 Live progress: labels track real phases instead of sleep loops
+        with st.status("Running agents…", expanded=True) as status:
             try:
+                status.update(label="Sending query to backend…")
                 response = requests.post(
                     f"{BACKEND_URL}/run",
                     json={"query": user_query},
@@ -67,13 +29,14 @@ if st.button("Run"):
 
                 if response.status_code == 200:
 
+                    status.update(label="Processing results…")
                     result = response.json().get("response", {})
-                    status = result.get("status")
+                    result_status = result.get("status")
 
-                    if status == "success":
+                    if result_status == "success":
                         data = result["data"]
 
-                        step("Result received ✔")
+                        status.update(label="Result received ✔", state="complete")
                         st.success("Result Found!")
 
                         # URL SECTION
@@ -86,7 +49,10 @@ if st.button("Run"):
 
                         # FULL TEXT SCROLL BOX
                         st.subheader("Summarized Full Text")
-                        st.markdown(
+                        # prefer the pre-escaped HTML from ReporterAgent; escape
+                        # here only for responses that don't carry it
+                        full_text_html = data.get("report_html") or html.escape(data["full_text"]).replace("\n", "<br>")
+                        st.html(
                             f"""
                             <div style="
                                 background-color:#111;
@@ -97,18 +63,20 @@ if st.button("Run"):
                                 border:1px solid #444;
                             ">
                                 <p style="color:#EEE; font-size:15px; line-height:1.6;">
-                                    {data["full_text"].replace("\n", "<br>")}
+                                    {full_text_html}
                                 </p>
                             </div>
-                            """,
-                            unsafe_allow_html=True
+                            """
                         )
 
                     else:
+                        status.update(label="Agent failed", state="error")
                         st.error(result.get("error", "No data returned."))
 
                 else:
+                    status.update(label="Backend error", state="error")
                     st.error(f"Backend Error: {response.text}")
 
             except Exception as e:
+                status.update(label="Connection failed", state="error")
                 st.error(f"Failed to connect to backend: {e}")
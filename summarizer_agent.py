@@ -1,9 +1,15 @@
 # agents/summarizer_agent.py
 
+import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class SummaryAgent:
+    # mostly network wait; run() stays on the orchestrator's thread pool
+    CPU_BOUND = False
+
     def __init__(self, model="llama-3.3-70b-versatile"):
         self.api_key = os.getenv("GROQ_API_KEY")
         if not self.api_key:
@@ -11,6 +17,18 @@ class SummaryAgent:
         self.endpoint = "https://api.groq.com/openai/v1/chat/completions"
         self.model = model
 
+        # Pooled session amortizes the TLS handshake to api.groq.com across runs
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.3),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Groq serves compressed JSON; brotli (requirements) handles "br"
+        self.session.headers.update({"Accept-Encoding": "gzip, br, deflate"})
+
     def run(self, text: str) -> dict:
         if not text:
             return {"status": "failed", "error": "No text to summarize"}
@@ -20,7 +38,24 @@ class SummaryAgent:
             "Authorization": f"Bearer {self.api_key}"
         }
 
-        payload = {
+        payload = self._build_payload(text)
+
+        try:
+            # stream=True: tokens are consumed as they arrive instead of
+            # buffering the whole completion before returning
+            with self.session.post(self.endpoint, headers=headers, json=payload, stream=True) as response:
+                if not response.ok:
+                    # read the error body while the stream is still open; after
+                    # the with-block closes it, .text comes back empty
+                    print("[SummaryAgent] API response:", response.text)
+                    return {"status": "failed", "error": f"HTTP {response.status_code}: {response.text}"}
+                summary = "".join(self._iter_sse_content(response.iter_lines()))
+            return {"status": "success", "data": {"summary": summary}}
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+
+    def _build_payload(self, text: str) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {
@@ -29,18 +64,72 @@ class SummaryAgent:
                 }
             ],
             "temperature": 0.2,
-            "max_completion_tokens": 500
+            "max_completion_tokens": 500,
+            "stream": True
         }
 
-        try:
-            response = requests.post(self.endpoint, headers=headers, json=payload)
+    @staticmethod
+    def _parse_sse_line(line) -> str:
+        """
+        Extract the delta content from one "data: {...}" SSE line, or "".
+        Raises RuntimeError with the API message on Groq error events.
+        """
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data: "):
+            return ""
+        chunk = line[len("data: "):]
+        if chunk == "[DONE]":
+            return ""
+        # chunks look like {"choices": [{"delta": {"content": "..."}}]},
+        # but error events arrive as {"error": {"message": "...", ...}}
+        obj = json.loads(chunk)
+        if "error" in obj:
+            err = obj["error"]
+            raise RuntimeError(err.get("message", str(err)) if isinstance(err, dict) else str(err))
+        choices = obj.get("choices")
+        if not choices:
+            return ""
+        delta = choices[0].get("delta") or {}
+        return delta.get("content") or ""
+
+    def _iter_sse_content(self, lines):
+        for line in lines:
+            if not line:
+                continue
+            content = self._parse_sse_line(line)
+            if content:
+                yield content
+
+    async def astream(self, text: str, client):
+        """
+        Async generator yielding summary tokens as Groq produces them, for
+        consumers (reporter, Streamlit) that can render incrementally.
+        """
+        if not text:
+            return
+
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+
+        async with client.stream("POST", self.endpoint, headers=headers, json=self._build_payload(text)) as response:
             response.raise_for_status()
-            result = response.json()
-            # According to docs: {"choices": [{"index":0, "message": {"role":"assistant","content": "..."} }]}
-            summary = result["choices"][0]["message"]["content"]
-            return {"status": "success", "data": {"summary": summary}}
-        except requests.exceptions.HTTPError as e:
-            print("[SummaryAgent] API response:", e.response.text)
-            return {"status": "failed", "error": str(e)}
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                content = self._parse_sse_line(line)
+                if content:
+                    yield content
+
+    async def arun(self, text: str, client) -> dict:
+        """Async variant of run(): accumulates the astream() tokens into one summary."""
+        if not text:
+            return {"status": "failed", "error": "No text to summarize"}
+
+        try:
+            parts = [token async for token in self.astream(text, client)]
+            return {"status": "success", "data": {"summary": "".join(parts)}}
         except Exception as e:
             return {"status": "failed", "error": str(e)}